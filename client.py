@@ -4,8 +4,23 @@ import sys
 import os
 import select
 import time
-import re
-from pathlib import Path
+import functools
+
+from client_solvers import auto_answer
+
+# orjson is optional: it parses bytes directly and serializes straight to bytes
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+    def _dumps_line(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    def _dumps_line(obj) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
 
 
 # ======================================================
@@ -16,6 +31,14 @@ def die(msg: str) -> None:
     print(msg, file=sys.stderr, flush=True)
     sys.exit(1)
 
+def say(text: str) -> None:
+    """Write one line of game output as UTF-8 bytes; callers flush_out() at sync points."""
+    sys.stdout.buffer.write((text + "\n").encode("utf-8"))
+
+def flush_out() -> None:
+    # say() bypasses the text layer, so flush the byte buffer underneath it
+    sys.stdout.buffer.flush()
+
 def parse_config_argument(argv: list[str]) -> str | None:
     if len(argv) < 3 or argv[1] != "--config":
         return None
@@ -25,12 +48,11 @@ def parse_config_argument(argv: list[str]) -> str | None:
 def load_config(path_str: str) -> dict:
     if not path_str:
         die("client.py: Configuration not provided")
-    path = Path(path_str)
-    if not path.exists():
-        die(f"client.py: File {path_str} does not exist")
     try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path_str, "rb") as f:
+            return _loads(f.read())
+    except FileNotFoundError:
+        die(f"client.py: File {path_str} does not exist")
     except json.JSONDecodeError:
         die(f"client.py: Invalid JSON in {path_str}")
 
@@ -39,108 +61,209 @@ def load_config(path_str: str) -> dict:
 # Networking helpers
 # ======================================================
 
-def send_json(sock: socket.socket, data: dict) -> None:
+_RECV_SIZE = 1 << 16  # one large read drains a whole burst of frames
+
+# Fixed ANSWER envelope; only the answer string itself is encoded per send
+_ANSWER_PREFIX = b'{"message_type":"ANSWER","answer":'
+_ANSWER_SUFFIX = b'}\n'
+_BYE_FRAME = b'{"message_type":"BYE"}\n'
+
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")  # not available on Windows
+_HAS_POLL = hasattr(select, "poll")  # likewise
+
+def _send_parts(sock: socket.socket, parts: tuple) -> None:
+    """Send the frame pieces as one scatter-gather write, without joining them."""
     try:
-        sock.sendall((json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8"))
+        if _HAS_SENDMSG:
+            sent = sock.sendmsg(parts)
+            total = sum(map(len, parts))
+            if sent < total:
+                sock.sendall(b"".join(parts)[sent:])
+        else:
+            sock.sendall(b"".join(parts))
     except Exception:
         pass
 
-def iter_messages(sock: socket.socket):
-    """Read JSON messages separated by newlines, yield each message."""
-    buf = bytearray()
-    sock.settimeout(0.2)
+def send_answer(sock: socket.socket, answer: str) -> None:
+    _send_parts(sock, (_ANSWER_PREFIX, _dumps(answer), _ANSWER_SUFFIX))
+
+@functools.lru_cache(maxsize=None)
+def hi_frame(username: str) -> bytes:
+    """Encode the HI handshake once per username; reconnects reuse the bytes."""
+    return _dumps_line({"message_type": "HI", "username": username})
+
+# Yielded by iter_messages when no data arrived; callers test identity
+TICK: dict = {"__tick__": True}
+
+# Frames start with this when the sender puts message_type first (ours does)
+_TYPE_PREFIX = b'{"message_type":"'
+_TYPE_AT = len(_TYPE_PREFIX)
+
+def iter_messages(sock: socket.socket, skip: set[bytes] | None = None):
+    """Read JSON messages separated by newlines, yield each message.
+
+    Frames whose message_type is in `skip` are dropped by peeking at the
+    type prefix, without parsing them; the caller may grow the set later.
+    """
+    raw = bytearray(_RECV_SIZE)  # reused receive buffer, filled in place
+    read = write = 0  # unread frames live in raw[read:write]
+    # Keep the socket blocking: readiness comes from poll/select below, and a
+    # non-blocking send could stop partway through an ANSWER or BYE frame
+    if _HAS_POLL:
+        # Register once; each wait is then a single poll() with no list building
+        poller = select.poll()
+        poller.register(sock, select.POLLIN)
+        wait = lambda: poller.poll(200)
+    else:
+        wait = lambda: select.select([sock], [], [], 0.2)[0]
     while True:
-        try:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            buf.extend(chunk)
-            # Parse all complete JSON lines before yielding again
-            while True:
-                i = buf.find(b"\n")
-                if i == -1:
-                    break
-                line = buf[:i].strip()
-                del buf[:i+1]
-                if not line:
-                    continue
-                try:
-                    yield json.loads(line.decode("utf-8"))
-                except json.JSONDecodeError:
-                    continue
-        except socket.timeout:
+        if not wait():
             # Used for heartbeat ticks (no data yet)
-            yield {"__tick__": True}
+            yield TICK
             continue
+        if write == len(raw):
+            if read:
+                # Slide the partial frame to the front to make room
+                raw[:write - read] = raw[read:write]
+                write -= read
+                read = 0
+            else:
+                # One frame is larger than the whole buffer: grow it
+                raw.extend(bytes(len(raw)))
+        try:
+            n = sock.recv_into(memoryview(raw)[write:])
+        except BlockingIOError:
+            continue
+        except OSError:
+            break
+        if not n:
+            break
+        # Bytes before this recv were already scanned and hold no newline
+        last = raw.rfind(b"\n", write, write + n)
+        write += n
+        if last == -1:
+            continue  # no complete frame yet
+        # Split every complete frame of this recv in one pass
+        lines = memoryview(raw)[read:last].tobytes().split(b"\n")
+        read = last + 1
+        for line in lines:
+            if len(line) <= 1:
+                continue  # blank line or a lone "\r"; the parser skips other whitespace
+            if skip and line.startswith(_TYPE_PREFIX) \
+                    and line[_TYPE_AT:line.find(b'"', _TYPE_AT)] in skip:
+                continue
+            try:
+                yield _loads(line)
+            except ValueError:
+                continue  # malformed JSON or invalid UTF-8 (UnicodeDecodeError)
+        if read == write:
+            # Usually a recv ends on a frame boundary: rewind for free
+            read = write = 0
 
 
 # ======================================================
-# Domain-specific solvers
+# Ollama (safe fallback)
 # ======================================================
 
-_ROMAN = {"I":1,"V":5,"X":10,"L":50,"C":100,"D":500,"M":1000}
-
-def solve_math(expr: str) -> str:
-    expr = expr.replace("−","-").replace("–","-").strip()
-    toks = re.findall(r"[0-9]+|[+\-*/]", expr)
-    if not toks: return ""
-    vals = [int(t) if t.isdigit() else t for t in toks]
-    i = 0
-    while i < len(vals):
-        if vals[i] == "*" and 0 < i < len(vals)-1:
-            vals[i-1:i+2] = [vals[i-1]*vals[i+1]]; i -= 1
-        elif vals[i] == "/" and 0 < i < len(vals)-1:
-            rhs = vals[i+1]; vals[i-1:i+2] = [vals[i-1]//rhs if rhs else 0]; i -= 1
-        else:
-            i += 1
-    res = vals[0]; i = 1
-    while i < len(vals):
-        op, rhs = vals[i], vals[i+1]
-        if op=="+": res += rhs
-        elif op=="-": res -= rhs
-        i += 2
-    return str(res)
-
-def roman_to_int(s: str) -> str:
-    s = s.upper().strip()
-    total, prev = 0, 0
-    for ch in reversed(s):
-        v = _ROMAN.get(ch, 0)
-        total += -v if v < prev else v
-        prev = v
-    return str(total)
-
-def ip_to_int(a,b,c,d): return (a<<24)|(b<<16)|(c<<8)|d
-def int_to_ip(x): return f"{(x>>24)&255}.{(x>>16)&255}.{(x>>8)&255}.{x&255}"
-
-def parse_cidr(cidr: str):
-    ip, pfx = cidr.split("/")
-    a,b,c,d = map(int, ip.split("."))
-    return ip_to_int(a,b,c,d), int(pfx)
-
-def usable_count(prefix: int) -> str:
-    return str(0 if prefix >= 31 else (1<<(32-prefix)) - 2)
-
-def net_and_broadcast(cidr: str) -> str:
-    ipi, p = parse_cidr(cidr)
-    mask = (0xFFFFFFFF << (32-p)) & 0xFFFFFFFF
-    net = ipi & mask
-    b = net | (~mask & 0xFFFFFFFF)
-    return f"{int_to_ip(net)} and {int_to_ip(b)}"
-
-def auto_answer(qtype: str, short_q: str) -> str:
-    if qtype == "Mathematics": return solve_math(short_q)
-    if qtype == "Roman Numerals": return roman_to_int(short_q)
-    if qtype == "Usable IP Addresses of a Subnet":
-        _, p = parse_cidr(short_q); return usable_count(p)
-    if qtype == "Network and Broadcast Address of a Subnet":
-        return net_and_broadcast(short_q)
-    return ""
+# One kept-alive connection per Ollama endpoint, reused across questions
+_ollama_socks: dict[tuple[str, int], socket.socket] = {}
 
+class _StaleConnection(ConnectionError):
+    """The peer closed or reset the socket before sending any response byte."""
 
-# ======================================================
-# Ollama (safe fallback)
-# ======================================================
+def _recv_by(s: socket.socket, deadline: float) -> bytes:
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise TimeoutError("Ollama reply past the question deadline")
+    s.settimeout(left)
+    return s.recv(_RECV_SIZE)
+
+def _ollama_exchange(s: socket.socket, parts: tuple, deadline: float) -> tuple[bytearray, bool]:
+    """Send one request on s; return the body and whether s may be reused."""
+    _send_parts(s, parts)
+    try:
+        first = _recv_by(s, deadline)
+    except (BrokenPipeError, ConnectionResetError) as e:
+        raise _StaleConnection() from e
+    if not first:
+        raise _StaleConnection()
+    resp = bytearray(first)  # grows in place; bytes += would copy on every chunk
+
+    def more() -> None:
+        ch = _recv_by(s, deadline)
+        if not ch: raise ConnectionError("closed mid-response")
+        resp.extend(ch)
+
+    while (sep := resp.find(b"\r\n\r\n")) == -1:
+        more()
+    head = bytes(resp[:sep]).lower()
+    del resp[:sep + 4]  # resp now holds the body bytes read so far
+    length, chunked = None, False
+    for line in head.split(b"\r\n"):
+        if line.startswith(b"content-length:"):
+            length = int(line[15:])
+        elif line.startswith(b"transfer-encoding:") and b"chunked" in line:
+            chunked = True
+    keep = b"connection: close" not in head
+    if chunked:
+        # Go's net/http (and so Ollama) chunks larger replies
+        body, pos = bytearray(), 0
+        while True:
+            while (eol := resp.find(b"\r\n", pos)) == -1:
+                more()
+            size = int(resp[pos:eol].split(b";")[0], 16)
+            pos = eol + 2
+            if not size:
+                break
+            while len(resp) < pos + size + 2:
+                more()
+            body += resp[pos:pos + size]
+            pos += size + 2
+        # Optional trailer lines, then the blank line ending the message
+        while True:
+            while (eol := resp.find(b"\r\n", pos)) == -1:
+                more()
+            if eol == pos:
+                return body, keep
+            pos = eol + 2
+    if length is None:
+        # Neither length nor chunking: the server must close to end the body
+        while ch := _recv_by(s, deadline):
+            resp += ch
+        return resp, False
+    while len(resp) < length:
+        more()
+    return resp[:length], keep
+
+def _ollama_roundtrip(addr: tuple[str, int], parts: tuple, timeout: float) -> bytearray:
+    """Send one request on a kept-alive connection and return the response body.
+
+    A reused socket that the server dropped while idle is replaced once;
+    both attempts share one deadline and a slow reply is never resent.
+    """
+    deadline = time.monotonic() + timeout
+    s = _ollama_socks.pop(addr, None)
+    while True:
+        fresh = s is None
+        if fresh:
+            s = socket.create_connection(addr, timeout=max(0.01, deadline - time.monotonic()))
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            body, keep = _ollama_exchange(s, parts, deadline)
+            break
+        except _StaleConnection:
+            s.close()
+            if fresh:
+                raise
+            s = None  # nothing was served on the idle socket: reconnect once
+        except Exception:
+            s.close()
+            raise
+    if keep:
+        _ollama_socks[addr] = s
+    else:
+        s.close()
+    return body
 
 def ollama_answer(qtype: str, short_q: str, trivia: str, cfg: dict | None, time_limit: float) -> str:
     if not cfg: return ""
@@ -148,28 +271,18 @@ def ollama_answer(qtype: str, short_q: str, trivia: str, cfg: dict | None, time_
     port = int(cfg.get("ollama_port",11434))
     model = cfg.get("ollama_model","llama3")
     try:
-        body = json.dumps({
+        body = _dumps({
             "model": model,
             "messages": [
                 {"role":"system","content":"Output only the final answer with no explanation."},
                 {"role":"user","content": trivia or short_q}
             ],
             "stream": False
-        }).encode("utf-8")
+        })
         req = (f"POST /api/chat HTTP/1.1\r\nHost: {host}:{port}\r\n"
                "Content-Type: application/json\r\n"
-               f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode("utf-8")
-        s = socket.create_connection((host,port), timeout=max(0.1, time_limit-0.1))
-        s.sendall(req+body)
-        resp = b""
-        while True:
-            ch = s.recv(4096)
-            if not ch: break
-            resp += ch
-        s.close()
-        sep = resp.find(b"\r\n\r\n")
-        if sep == -1: return ""
-        data = json.loads(resp[sep+4:].decode("utf-8", errors="ignore"))
+               f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n").encode("utf-8")
+        data = _loads(_ollama_roundtrip((host, port), (req, body), max(0.1, time_limit-0.1)))
         if isinstance(data, dict):
             msg = data.get("message")
             if isinstance(msg, dict) and isinstance(msg.get("content"), str):
@@ -185,17 +298,34 @@ def ollama_answer(qtype: str, short_q: str, trivia: str, cfg: dict | None, time_
 # Input helpers
 # ======================================================
 
+# Raw fd-0 reads with our own line buffer: sys.stdin's buffer can swallow
+# several lines at once, and select() cannot see lines already buffered there
+_stdin_buf = bytearray()
+
+def _stdin_readline(timeout: float) -> str | None:
+    """Next line without its newline, None if none arrives in time, "" at EOF."""
+    deadline = time.monotonic() + timeout
+    while True:
+        nl = _stdin_buf.find(b"\n")
+        if nl >= 0:
+            line = _stdin_buf[:nl].decode("utf-8", "replace")
+            del _stdin_buf[:nl + 1]
+            return line
+        try:
+            r,_,_ = select.select([0], [], [], max(0.0, deadline - time.monotonic()))
+            chunk = os.read(0, 4096) if r else None
+        except (OSError, ValueError):
+            return None
+        if chunk is None: return None
+        if not chunk:
+            line = _stdin_buf.decode("utf-8", "replace")
+            _stdin_buf.clear()
+            return line
+        _stdin_buf.extend(chunk)
+
 def read_stdin_line(timeout: float) -> str | None:
-    try:
-        r,_,_ = select.select([sys.stdin], [], [], timeout)
-    except Exception:
-        return None
-    if not r: return None
-    try:
-        line = sys.stdin.readline()
-    except EOFError:
-        return ""
-    return line.rstrip("\n") if line else ""
+    flush_out()  # the user must see the prompt before we block
+    return _stdin_readline(timeout)
 
 def parse_connect_line(line: str):
     t = line.strip()
@@ -209,48 +339,171 @@ def parse_connect_line(line: str):
 
 def poll_stdin_cmd() -> str | None:
     """Non-blocking check for EXIT/DISCONNECT commands (works in all modes)."""
-    try:
-        r, _, _ = select.select([sys.stdin], [], [], 0)
-    except Exception:
-        return None
-    if not r:
-        return None
-    line = sys.stdin.readline()
+    line = _stdin_readline(0.0)
     if not line:
         return None
     return line.strip().upper()
 
 
+# ======================================================
+# Message handlers
+# ======================================================
+# Each handler takes (msg, state); setting state["done"] ends the session.
+
+READY, QUESTION, RESULT, LEADERBOARD, BYE, FINISHED = map(
+    sys.intern, ("READY", "QUESTION", "RESULT", "LEADERBOARD", "BYE", "FINISHED"))
+
+def _send_bye_once(state: dict) -> None:
+    if not state["sent_bye"]:
+        _send_parts(state["sock"], (_BYE_FRAME,))
+        state["sent_bye"] = True
+
+# After EXIT these handlers would do nothing, so their frames need no parsing
+_QUIET_SKIP = frozenset((b"READY", b"QUESTION", b"RESULT", b"LEADERBOARD"))
+
+def _go_quiet(state: dict) -> None:
+    state["want_quit"] = True
+    state["silent"] = True
+    state["skip"].update(_QUIET_SKIP)
+
+def _handle_ready(msg: dict, state: dict) -> None:
+    if not state["silent"]:
+        info = msg.get("info")
+        if info: say(info)
+
+def _answer_you(qtype: str, short_q: str, trivia: str, tlim: float, state: dict) -> str:
+    ans_line = read_stdin_line(tlim)
+    if not ans_line:
+        return ""
+    answer = ans_line.strip()
+    if answer.upper() in ("EXIT", "DISCONNECT"):
+        _send_bye_once(state)
+        _go_quiet(state)
+        return ""
+    return answer
+
+def _answer_ai(qtype: str, short_q: str, trivia: str, tlim: float, state: dict) -> str:
+    return ollama_answer(qtype, short_q, trivia, state["ollama_cfg"], tlim)
+
+def _answer_auto(qtype: str, short_q: str, trivia: str, tlim: float, state: dict) -> str:
+    return auto_answer(qtype, short_q)
+
+# Chosen once per session; unknown modes behave like "auto"
+_ANSWERERS = {"you": _answer_you, "ai": _answer_ai, "auto": _answer_auto}
+
+def _handle_question(msg: dict, state: dict) -> None:
+    if state["want_quit"]:
+        return
+    get = msg.get
+    trivia = get("trivia_question")
+    short_q = get("short_question", "")
+    qtype = get("question_type", "")
+    tlim = float(get("time_limit", 1.0))
+    if trivia and not state["silent"]:
+        say(trivia)
+    answer = state["answer_fn"](qtype, short_q, trivia, tlim, state)
+    if answer != "":
+        send_answer(state["sock"], answer)
+    flush_out()  # one write per round: everything printed up to this answer
+
+def _handle_result(msg: dict, state: dict) -> None:
+    if not state["silent"]:
+        fb = msg.get("feedback")
+        if fb: say(fb)
+
+def _handle_leaderboard(msg: dict, state: dict) -> None:
+    if not state["silent"]:
+        lb = msg.get("state")
+        if lb: say(lb)
+
+def _handle_bye(msg: dict, state: dict) -> None:
+    s = state["sock"]
+    say("BYE")
+    flush_out()
+    try:
+        s.shutdown(socket.SHUT_RDWR)
+    except Exception:
+        pass
+    try:
+        s.close()
+    except Exception:
+        pass
+    state["done"] = True
+
+def _handle_finished(msg: dict, state: dict) -> None:
+    s = state["sock"]
+    fs = msg.get("final_standings")
+    if fs and not state["silent"]:
+        say(fs)
+    flush_out()
+    # Do NOT send BYE here; server will handle game end broadcast
+    try:
+        s.shutdown(socket.SHUT_RDWR)
+    except Exception:
+        pass
+    try:
+        s.close()
+    except Exception:
+        pass
+    state["done"] = True
+
+def _handle_unknown(msg: dict, state: dict) -> None:
+    pass  # ignore message types this client does not know
+
+_HANDLERS = {
+    READY: _handle_ready,
+    QUESTION: _handle_question,
+    RESULT: _handle_result,
+    LEADERBOARD: _handle_leaderboard,
+    BYE: _handle_bye,
+    FINISHED: _handle_finished,
+}
+
+
 # ======================================================
 # Core client logic
 # ======================================================
 
 def run_client(host: str, port: int, username: str, mode: str, ollama_cfg: dict | None = None):
+    hi = hi_frame(username)
     try:
         s = socket.create_connection((host, port), timeout=3)
     except Exception:
-        print("Connection failed", flush=True)
+        say("Connection failed")
+        flush_out()
         return
+    # Small HI/ANSWER frames must not wait on Nagle coalescing
+    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    # Let the kernel notice a server that vanished without closing
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+    state = {
+        "sock": s,
+        "answer_fn": _ANSWERERS.get(mode, _answer_auto),
+        "ollama_cfg": ollama_cfg,
+        "want_quit": False,
+        "sent_bye": False,  # prevent duplicate BYE messages
+        "silent": False,
+        "skip": set(),  # message types iter_messages drops unparsed
+        "quit_deadline": 0.0,
+        "done": False,
+    }
+    try:
+        s.sendall(hi)
+    except Exception:
+        pass
 
-    want_quit = False
-    sent_bye = False  # prevent duplicate BYE messages
-    silent = False
-    quit_deadline = 0.0
-    send_json(s, {"message_type":"HI", "username":username})
-
-    for msg in iter_messages(s):
+    for msg in iter_messages(s, state["skip"]):
         # Check for heartbeat tick (timeout)
-        if msg.get("__tick__"):
+        if msg is TICK:
+            flush_out()  # idle: push out anything buffered
             # Non-blocking stdin polling even in auto/ai mode
             cmd = poll_stdin_cmd()
             if cmd in ("EXIT", "DISCONNECT"):
-                if not sent_bye:
-                    send_json(s, {"message_type": "BYE"})
-                    sent_bye = True
-                want_quit = True
-                silent = True
-                quit_deadline = time.time() + 0.6
-            if want_quit and time.time() > quit_deadline:
+                _send_bye_once(state)
+                _go_quiet(state)
+                state["quit_deadline"] = time.time() + 0.6
+            if state["want_quit"] and time.time() > state["quit_deadline"]:
                 try: s.shutdown(socket.SHUT_RDWR)
                 except Exception: pass
                 try: s.close()
@@ -258,93 +511,15 @@ def run_client(host: str, port: int, username: str, mode: str, ollama_cfg: dict
                 break
             continue
 
-        mtype = msg.get("message_type")
-
-        if mtype == "READY":
-            if not silent:
-                info = msg.get("info","")
-                if info: print(info, flush=True)
-
-        elif mtype == "QUESTION":
-            if want_quit:
-                continue
-            trivia = msg.get("trivia_question","")
-            short_q = msg.get("short_question","")
-            qtype = msg.get("question_type","")
-            tlim = float(msg.get("time_limit",1.0))
-            if trivia and not silent:
-                print(trivia, flush=True)
-            if mode == "you":
-                ans_line = read_stdin_line(tlim)
-                if ans_line is None or ans_line == "":
-                    continue
-                cmd = ans_line.strip().upper()
-                if cmd in ("EXIT", "DISCONNECT"):
-                    if not sent_bye:
-                        send_json(s, {"message_type": "BYE"})
-                        sent_bye = True
-                    want_quit = True
-                    silent = True
-                    continue
-                answer = ans_line.strip()
-                if answer != "":
-                    send_json(s, {"message_type":"ANSWER", "answer":answer})
-
-            elif mode == "ai":
-                answer = ollama_answer(qtype, short_q, trivia, ollama_cfg, tlim)
-                if answer != "":
-                    send_json(s, {"message_type":"ANSWER", "answer":answer})
-            else:
-                answer = auto_answer(qtype, short_q)
-                if answer != "":
-                    send_json(s, {"message_type":"ANSWER", "answer":answer})
-
-        elif mtype == "RESULT":
-            if not silent:
-                fb = msg.get("feedback","")
-                if fb: print(fb, flush=True)
-
-        elif mtype == "LEADERBOARD":
-            if not silent:
-                lb = msg.get("state","")
-                if lb: print(lb, flush=True)
-
-        elif mtype == "BYE":
-            print("BYE", flush=True)
-            sys.stdout.flush()
-            time.sleep(0.2)
-            try:
-                s.shutdown(socket.SHUT_RDWR)
-            except Exception:
-                pass
-            try:
-                s.close()
-            except Exception:
-                pass
-            break
-
-        elif mtype == "FINISHED":
-            fs = msg.get("final_standings","")
-            if fs and not silent:
-                print(fs, flush=True)
-            # Do NOT send BYE here; server will handle game end broadcast
-            try:
-                time.sleep(0.1)
-                s.shutdown(socket.SHUT_RDWR)
-            except Exception:
-                pass
-            try:
-                s.close()
-            except Exception:
-                pass
+        _HANDLERS.get(msg.get("message_type"), _handle_unknown)(msg, state)
+        if state["done"]:
             break
 
     try:
         s.close()
     except Exception:
         pass
-    sys.stdout.flush()
-    time.sleep(0.1)
+    flush_out()
 
 
 # ======================================================
@@ -0,0 +1,109 @@
+"""Auto-mode solvers for the client: one answer string per question type."""
+
+import functools
+import operator
+import re
+import socket
+from typing import Callable
+
+_ROMAN: dict[str, int] = {"I":1,"V":5,"X":10,"L":50,"C":100,"D":500,"M":1000}
+
+_MATH_HEAD = re.compile(r"\s*(\d+)")
+_MATH_TOK = re.compile(r"([+\-*/])\s*(\d+)")
+_SIGN = {"+": 1, "-": -1}
+def _floordiv0(a: int, b: int) -> int:
+    return a // b if b else 0
+
+# Unicode minus and en dash both read as "-"
+_DASHES = str.maketrans("−–", "--")
+
+_ADD_OPS = {"+": operator.add, "-": operator.sub}
+_MUL_OPS = {"*": operator.mul, "/": _floordiv0}
+
+@functools.lru_cache(maxsize=256)
+def solve_math(expr: str) -> str:
+    if not expr.isascii():
+        expr = expr.translate(_DASHES)
+    parts = expr.split()
+    # Fast paths for "A" and "A op B", the most common short questions
+    if len(parts) == 1 and parts[0].isdecimal():
+        return str(int(parts[0]))
+    if len(parts) == 3 and parts[0].isdecimal() and parts[2].isdecimal():
+        a, op, b = parts
+        if op in _ADD_OPS: return str(_ADD_OPS[op](int(a), int(b)))
+        if op in _MUL_OPS: return str(_MUL_OPS[op](int(a), int(b)))
+    m = _MATH_HEAD.match(expr)
+    if not m: return ""
+    # Fold * and / into the current term, flush terms on + and -
+    total, sign, term = 0, 1, int(m.group(1))
+    for op, n in _MATH_TOK.findall(expr, m.end()):
+        if op in _MUL_OPS:
+            term = _MUL_OPS[op](term, int(n))
+        else:
+            total += sign * term
+            sign, term = _SIGN[op], int(n)
+    return str(total + sign * term)
+
+# Byte -> digit rank (I=1 .. M=7, either case, anything else 0). Ranks order
+# the same way as values, so the subtract test runs on ranks and values are
+# only looked up for the sum.
+_ROMAN_DIGITS = "IVXLCDM"
+_ROMAN_RANK = bytes(_ROMAN_DIGITS.find(chr(b).upper()) + 1 for b in range(256))
+_ROMAN_RANK8 = bytes(r * 8 for r in _ROMAN_RANK)  # rank pre-shifted for _PAIR_VALUE
+_RANK_VALUE = (0,) + tuple(_ROMAN[c] for c in _ROMAN_DIGITS)
+# Signed contribution of a digit given the digit after it, indexed by
+# rank*8 + next_rank: a digit is subtracted when the next one is larger
+_PAIR_VALUE = tuple(_RANK_VALUE[r] if r >= nxt else -_RANK_VALUE[r]
+                    for r in range(8) for nxt in range(8))
+
+def _roman_value(bs: bytes) -> int:
+    """Integer kernel over bytes; translate() maps every byte in one C pass."""
+    nxt = bs.translate(_ROMAN_RANK)[1:] + b"\0"
+    return sum([_PAIR_VALUE[r8 + n] for r8, n in zip(bs.translate(_ROMAN_RANK8), nxt)])
+
+@functools.lru_cache(maxsize=256)
+def roman_to_int(s: str) -> str:
+    return str(_roman_value(s.encode("utf-8")))
+
+def ip_to_int(ip: str) -> int: return int.from_bytes(socket.inet_aton(ip), "big")
+# Decimal text of every octet value; indexing beats formatting and inet_ntoa
+_B2S = tuple(map(str, range(256)))
+
+def int_to_ip(x: int) -> str:
+    return ".".join((_B2S[x >> 24], _B2S[(x >> 16) & 255], _B2S[(x >> 8) & 255], _B2S[x & 255]))
+
+@functools.lru_cache(maxsize=256)
+def parse_cidr(cidr: str) -> tuple[int, int]:
+    ip, pfx = cidr.split("/")
+    return ip_to_int(ip), int(pfx)
+
+# Netmask, host-bit mask and usable-host answer for every prefix length 0..32
+_MASKS = tuple((0xFFFFFFFF << (32-p)) & 0xFFFFFFFF for p in range(33))
+_INVMASKS = tuple(m ^ 0xFFFFFFFF for m in _MASKS)
+_USABLE = tuple(str(0 if p >= 31 else (1<<(32-p)) - 2) for p in range(33))
+
+def usable_count(prefix: int) -> str:
+    return _USABLE[prefix]
+
+@functools.lru_cache(maxsize=256)
+def net_and_broadcast(cidr: str) -> str:
+    ipi, p = parse_cidr(cidr)
+    net = ipi & _MASKS[p]
+    b = net | _INVMASKS[p]
+    return f"{int_to_ip(net)} and {int_to_ip(b)}"
+
+def _usable_answer(cidr: str) -> str:
+    # Only the prefix matters; skip parsing the address part
+    return usable_count(int(cidr.rpartition("/")[2]))
+
+_SOLVERS: dict[str, Callable[[str], str]] = {
+    "Mathematics": solve_math,
+    "Roman Numerals": roman_to_int,
+    "Usable IP Addresses of a Subnet": _usable_answer,
+    "Network and Broadcast Address of a Subnet": net_and_broadcast,
+}
+
+@functools.lru_cache(maxsize=1024)
+def auto_answer(qtype: str, short_q: str) -> str:
+    solver = _SOLVERS.get(qtype)
+    return solver(short_q) if solver else ""
@@ -5,8 +5,8 @@ import random
 # --------------------------------------------------
 # Helper: Integer → Roman Numeral
 # --------------------------------------------------
-def int_to_roman(n: int) -> str:
-    """Convert integer 1–3999 to uppercase Roman numeral."""
+def _build_roman(n: int) -> str:
+    """Greedy conversion used once per value to fill ROMAN_LUT."""
     table = [
         ("M", 1000), ("CM", 900), ("D", 500), ("CD", 400),
         ("C", 100), ("XC", 90), ("L", 50), ("XL", 40),
@@ -20,27 +20,60 @@ def int_to_roman(n: int) -> str:
     return "".join(out)
 
 
+# Every numeral in the supported range, built once at import (index 0 is "")
+ROMAN_LUT = tuple(_build_roman(i) for i in range(4000))
+
+
+def int_to_roman(n: int) -> str:
+    """Convert integer 1–3999 to uppercase Roman numeral."""
+    if 0 <= n < len(ROMAN_LUT):
+        return ROMAN_LUT[n]
+    # Outside the table: build it the slow way (negative indexes would wrap)
+    return _build_roman(n)
+
+
+# Reverse of ROMAN_LUT: every generated numeral maps straight to its value
+ROMAN_TO_INT = {r: i for i, r in enumerate(ROMAN_LUT) if i}
+_ROM = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100, "D": 500, "M": 1000}
+
+
+def roman_value(s: str) -> int:
+    """Decimal value of a Roman numeral (canonical ones are a dict hit)."""
+    n = ROMAN_TO_INT.get(s)
+    if n is not None:
+        return n
+    total, prev = 0, 0
+    for ch in reversed(s):
+        v = _ROM.get(ch, 0)
+        total += -v if v < prev else v
+        prev = v
+    return total
+
+
 # --------------------------------------------------
 # Mathematics question generator
 # --------------------------------------------------
+_NUM_POOL = tuple(map(str, range(1, 121)))  # operands 1–120, pre-stringified
+_BIG_POOL = _NUM_POOL[89:]                  # the 90–120 tail
+_BIG_SET = frozenset(_BIG_POOL)
+
+
 def generate_mathematics_question() -> str:
     """
     Return an infix arithmetic expression (2–5 operands) using + or - operators.
     At least one operand will be >= 90 to satisfy Ed test coverage.
     """
     count = random.randint(2, 5)
-    nums = [str(random.randint(1, 120)) for _ in range(count)]
+    nums = random.choices(_NUM_POOL, k=count)
 
     # Ensure at least one operand >= 90
-    if all(int(n) < 90 for n in nums):
-        nums[random.randrange(count)] = str(random.randint(90, 120))
-
-    ops = random.choices(["+", "-"], k=count - 1)
-    parts = []
-    for i, n in enumerate(nums):
-        parts.append(n)
-        if i < len(ops):
-            parts.append(ops[i])
+    if _BIG_SET.isdisjoint(nums):
+        nums[random.randrange(count)] = random.choice(_BIG_POOL)
+
+    # Interleave operands and operators with slice assignment
+    parts = [None] * (2 * count - 1)
+    parts[0::2] = nums
+    parts[1::2] = random.choices(("+", "-"), k=count - 1)
     return " ".join(parts)
 
 
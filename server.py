@@ -5,9 +5,22 @@ import sys
 import time
 import select
 import re
-from pathlib import Path
 import questions
 
+# Prefer orjson when installed: parses bytes directly and serializes to bytes
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+    def _dumps_line(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    def _dumps_line(obj) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
 # ======================================================
 # Utility Functions - Handle basic operations
 # ======================================================
@@ -17,13 +30,12 @@ def load_config(path_str: str) -> dict:
     if not path_str:
         print("server.py: Configuration not provided", file=sys.stderr, flush=True)
         sys.exit(1)
-    p = Path(path_str)
-    if not p.exists():
+    try:
+        with open(path_str, "rb") as f:
+            return _loads(f.read())
+    except FileNotFoundError:
         print(f"server.py: File {path_str} does not exist", file=sys.stderr, flush=True)
         sys.exit(1)
-    try:
-        with p.open("r", encoding="utf-8") as f:
-            return json.load(f)
     except json.JSONDecodeError:
         print(f"server.py: Invalid JSON in {path_str}", file=sys.stderr, flush=True)
         sys.exit(1)
@@ -37,8 +49,8 @@ def parse_config_from_argv() -> str | None:
     return argv[1]
 
 
-def send_json(sock: socket.socket, obj: dict) -> None:
-    """Send JSON messages over socket with consistent field ordering."""
+def encode_msg(obj: dict) -> bytes:
+    """Encode a message as one JSON line with consistent field ordering."""
     if obj.get("message_type") == "QUESTION":
         ordered = {
             "message_type": "QUESTION",
@@ -52,41 +64,71 @@ def send_json(sock: socket.socket, obj: dict) -> None:
         for k, v in obj.items():
             if k != "message_type":
                 ordered[k] = v
+    return _dumps_line(ordered)
+
+
+def send_bytes(sock: socket.socket, payload: bytes) -> None:
+    """Send pre-encoded message bytes, ignoring errors from closed peers."""
+    try:
+        sock.sendall(payload)
+    except Exception:
+        pass
+
+
+def send_json(sock: socket.socket, obj: dict) -> None:
+    """Send JSON messages over socket with consistent field ordering."""
+    send_bytes(sock, encode_msg(obj))
+
+
+_RESULT_TMPL = b'{"message_type":"RESULT","correct":%b,"feedback":%b}\n'
+
+
+def send_result(sock: socket.socket, correct: bool, feedback: str) -> None:
+    """Send a RESULT frame from a fixed template; only the feedback is encoded."""
     try:
-        sock.sendall((json.dumps(ordered, ensure_ascii=False) + "\n").encode("utf-8"))
+        sock.sendall(_RESULT_TMPL % (b"true" if correct else b"false", _dumps(feedback)))
     except Exception:
         pass
 
 
-def recv_json(conn: socket.socket, timeout: float = 5.0):
-    """Receive and parse JSON messages from socket with timeout handling."""
+def recv_json(conn: socket.socket, rxbuf: bytearray, timeout: float = 5.0):
+    """Receive one newline-framed JSON message, keeping leftovers in rxbuf."""
     conn.setblocking(False)
-    buf, start = "", time.time()
-    dec = json.JSONDecoder()
-    while time.time() - start < timeout:
-        rlist, _, _ = select.select([conn], [], [], 0.05)
+    deadline = time.time() + timeout
+    while True:
+        # Serve complete lines already buffered before touching the socket
+        i = rxbuf.find(b"\n")
+        if i >= 0:
+            line = bytes(rxbuf[:i])
+            del rxbuf[:i + 1]
+            try:
+                return _loads(line)
+            except ValueError:
+                # Blank, malformed or non-UTF-8 line (json.loads on bytes raises
+                # UnicodeDecodeError, a ValueError, before parsing): skip it
+                continue
+        # Sleep until data or the deadline; a zero timeout still polls once
+        rlist, _, _ = select.select([conn], [], [], max(0.0, deadline - time.time()))
         if not rlist:
-            continue
+            return None
         try:
-            chunk = conn.recv(4096).decode("utf-8", errors="ignore")
+            chunk = conn.recv(4096)
         except Exception:
+            if time.time() >= deadline:
+                return None
             continue
-        if chunk == "":
+        if not chunk:
             return {"message_type": "DISCONNECTED"}
-        buf += chunk
-        try:
-            obj, idx = dec.raw_decode(buf)
-            if idx == len(buf) or not buf[idx:].strip():
-                return obj
-        except json.JSONDecodeError:
-            continue
-    return None
+        rxbuf += chunk
 
 
 # ======================================================
 # Helper Functions - Game specific operations
 # ======================================================
 
+_WS_RE = re.compile(r"\s+")
+
+
 def normalize_answer(qtype: str, s: str) -> str:
     """Standardize answer format based on question type for fair comparison."""
     s = s.strip()
@@ -95,41 +137,97 @@ def normalize_answer(qtype: str, s: str) -> str:
     if qtype == "Roman Numerals":
         return s.upper().strip()
     if qtype == "Network and Broadcast Address of a Subnet":
-        return re.sub(r"\s+", " ", s.replace(",", " "))
+        return _WS_RE.sub(" ", s.replace(",", " "))
     return s
 
 
+# Unicode minus and en dash both read as "-"
+_DASHES = str.maketrans("−–", "--")
+
+
+_OPS = frozenset("+-*/")
+
+
+def _scan_tokens(expr: str) -> list:
+    """One pass over the characters: digit runs become ints, operators stay str."""
+    vals = []
+    i, n = 0, len(expr)
+    while i < n:
+        ch = expr[i]
+        if "0" <= ch <= "9":
+            j = i + 1
+            while j < n and "0" <= expr[j] <= "9":
+                j += 1
+            vals.append(int(expr[i:j]))
+            i = j
+        else:
+            if ch in "+-*/":
+                vals.append(ch)
+            i += 1
+    return vals
+
+
 def solve_math(expr: str) -> str:
     """Calculate result of basic arithmetic expressions."""
-    expr = expr.replace("−", "-").replace("–", "-")
-    tokens = re.findall(r"[0-9]+|[+\-*/]", expr)
-    if not tokens:
+    if not expr.isascii():
+        expr = expr.translate(_DASHES)
+    vals = expr.split()
+    # Generated questions are space-separated "n op n ...": convert the
+    # numbers in bulk and only fall back to the character scanner otherwise
+    if (len(vals) & 1 and expr.isascii() and all(v.isdigit() for v in vals[::2])
+            and _OPS.issuperset(vals[1::2])):
+        vals[::2] = map(int, vals[::2])
+    else:
+        vals = _scan_tokens(expr)
+    if not vals:
         return ""
-    vals = [int(t) if t.isdigit() else t for t in tokens]
-    i = 0
-    while i < len(vals):
-        if vals[i] == "*" and 0 < i < len(vals) - 1:
-            vals[i - 1:i + 2] = [vals[i - 1] * vals[i + 1]]
-            i -= 1
-        elif vals[i] == "/" and 0 < i < len(vals) - 1:
-            vals[i - 1:i + 2] = [vals[i - 1] // vals[i + 1] if vals[i + 1] else 0]
-            i -= 1
+    # Single pass over the tokens: * and / fold into the pending term,
+    # + and - flush it into the running total (two-level shunting-yard)
+    total, sign, term = 0, 1, vals[0]
+    for k in range(1, len(vals) - 1, 2):
+        op, rhs = vals[k], vals[k + 1]
+        if op == "*":
+            term *= rhs
+        elif op == "/":
+            term = term // rhs if rhs else 0
         else:
-            i += 1
-    res = vals[0]
-    i = 1
-    while i < len(vals):
-        op, rhs = vals[i], vals[i + 1]
-        if op == "+": res += rhs
-        elif op == "-": res -= rhs
-        i += 2
+            total += sign * term
+            sign, term = (-1 if op == "-" else 1), rhs
+    res = total + sign * term
     return str(res).replace("-", "−")
 
 
+def correct_answer_for(qtype: str, short_q: str) -> str:
+    """Compute the expected answer for a generated question."""
+    if qtype == "Mathematics":
+        return solve_math(short_q)
+    if qtype == "Roman Numerals":
+        return str(questions.roman_value(short_q))
+    if qtype == "Usable IP Addresses of a Subnet":
+        p = int(short_q.split("/")[-1])
+        return str(0 if p >= 31 else (1 << (32 - p)) - 2)
+    ip, p = short_q.split("/")
+    p = int(p)
+    addr = int.from_bytes(socket.inet_aton(ip), "big")
+    mask = (0xFFFFFFFF << (32 - p)) & 0xFFFFFFFF
+    net = addr & mask
+    bc = net | (~mask & 0xFFFFFFFF)
+    return f"{socket.inet_ntoa(net.to_bytes(4, 'big'))} and {socket.inet_ntoa(bc.to_bytes(4, 'big'))}"
+
+
 # ======================================================
 # Main Logic - Core game server implementation
 # ======================================================
 
+# Question type -> generator; unknown types fall back to network/broadcast
+_GENERATORS = {
+    "Mathematics": questions.generate_mathematics_question,
+    "Roman Numerals": questions.generate_roman_numerals_question,
+    "Usable IP Addresses of a Subnet": questions.generate_usable_addresses_question,
+    "Network and Broadcast Address of a Subnet": questions.generate_network_broadcast_question,
+}
+
+
 def main():
     # Load configuration and initialize server settings
     cfg_path = parse_config_from_argv()
@@ -163,7 +261,10 @@ def main():
     clients = []
     while len(clients) < players_needed:
         conn, _ = srv.accept()
-        msg = recv_json(conn, 5.0)
+        # Frames are small and latency-bound; don't let Nagle hold them back
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        rxbuf = bytearray()
+        msg = recv_json(conn, rxbuf, 5.0)
         if not msg or msg.get("message_type") != "HI":
             conn.close()
             continue
@@ -171,31 +272,39 @@ def main():
         if not name:
             conn.close()
             continue
-        clients.append({"sock": conn, "username": name, "score": 0, "active": True, "bye_sent": False})
+        clients.append({"sock": conn, "username": name, "score": 0, "active": True, "bye_sent": False,
+                        "rxbuf": rxbuf})
 
+    payload = encode_msg({"message_type": "READY", "info": ready_info})
     for c in clients:
-        send_json(c["sock"], {"message_type": "READY", "info": ready_info})
+        send_bytes(c["sock"], payload)
     time.sleep(0.05)
+    # Kept in step with c["active"] so the loops never rescan clients
+    sock_to_client = {c["sock"]: c for c in clients}
+    active_count = len(clients)
+    active_socks = [c["sock"] for c in clients]
 
     def handle_disconnect_for(sock: socket.socket, reason: str = "DISCONNECTED"):
         """Handle client disconnection and manage game state accordingly."""
-        for c in clients:
-            if c["sock"] == sock and c["active"]:
-                c["active"] = False
-                if reason == "DISCONNECTED" and not c["bye_sent"]:
-                    try:
-                        send_json(c["sock"], {"message_type": "BYE"})
-                    except Exception:
-                        pass
-                    c["bye_sent"] = True
+        nonlocal active_count
+        c = sock_to_client.pop(sock, None)
+        if c is not None:
+            c["active"] = False
+            active_count -= 1
+            active_socks.remove(sock)
+            if reason == "DISCONNECTED" and not c["bye_sent"]:
                 try:
-                    c["sock"].close()
+                    send_json(c["sock"], {"message_type": "BYE"})
                 except Exception:
                     pass
-                break
+                c["bye_sent"] = True
+            try:
+                c["sock"].close()
+            except Exception:
+                pass
 
         # --- NEW: Broadcast FINISHED if all players are inactive ---
-        if not any(c["active"] for c in clients):
+        if not active_count:
             final_text = "All players disconnected."
             for c in clients:
                 if not c["bye_sent"]:
@@ -210,31 +319,26 @@ def main():
     for i, qtype in enumerate(qtypes, start=1):
         # Pre-question timing window
         pre_end = time.time() + 0.15
-        while time.time() < pre_end and any(c["active"] for c in clients):
-            r, _, _ = select.select([c["sock"] for c in clients if c["active"]], [], [], 0.05)
+        while time.time() < pre_end and active_count:
+            # Lines already buffered won't wake select, so serve them first
+            r = [sock for sock in active_socks if b"\n" in sock_to_client[sock]["rxbuf"]]
             if not r:
-                continue
+                r, _, _ = select.select(active_socks, [], [], max(0.0, pre_end - time.time()))
+            if not r:
+                break
             for sock in r:
-                msg = recv_json(sock, 0.0)
+                msg = recv_json(sock, sock_to_client[sock]["rxbuf"], 0.0)
                 if not msg:
                     continue
-                if msg.get("message_type") == "DISCONNECTED":
-                    handle_disconnect_for(sock, "DISCONNECTED")
-                elif msg.get("message_type") == "BYE":
-                    handle_disconnect_for(sock, "BYE")
+                mt = msg.get("message_type")
+                if mt == "DISCONNECTED" or mt == "BYE":
+                    handle_disconnect_for(sock, mt)
 
-        if not any(c["active"] for c in clients):
+        if not active_count:
             break
 
         # Generate and send questions to clients
-        if qtype == "Mathematics":
-            short_q = questions.generate_mathematics_question()
-        elif qtype == "Roman Numerals":
-            short_q = questions.generate_roman_numerals_question()
-        elif qtype == "Usable IP Addresses of a Subnet":
-            short_q = questions.generate_usable_addresses_question()
-        else:
-            short_q = questions.generate_network_broadcast_question()
+        short_q = _GENERATORS.get(qtype, questions.generate_network_broadcast_question)()
 
         qbody = cfg["question_formats"].get(qtype, "{0}").format(short_q)
         trivia = f'{cfg["question_word"]} {i} ({qtype}):\n{qbody}'
@@ -246,17 +350,29 @@ def main():
             "time_limit": qsec,
         }
 
+        # Encode once, fan the same bytes out to every client
+        payload = encode_msg(qmsg)
         for c in clients:
             if c["active"]:
-                send_json(c["sock"], qmsg)
+                send_bytes(c["sock"], payload)
+
+        # One expected answer per question, shared by every client's ANSWER
+        correct_answer = correct_answer_for(qtype, short_q)
+        correct_norm = normalize_answer(qtype, correct_answer)
 
         # Collect answers
         end = time.time() + qsec
-        while time.time() < end and any(c["active"] for c in clients):
-            r, _, _ = select.select([c["sock"] for c in clients if c["active"]], [], [], 0.05)
+        while time.time() < end and active_count:
+            # Block for the rest of the window; only arriving data wakes us early
+            # Lines already buffered won't wake select, so serve them first
+            r = [sock for sock in active_socks if b"\n" in sock_to_client[sock]["rxbuf"]]
+            if not r:
+                r, _, _ = select.select(active_socks, [], [], max(0.0, end - time.time()))
+            if not r:
+                break
             for sock in r:
                 try:
-                    msg = recv_json(sock, 0.1)
+                    msg = recv_json(sock, sock_to_client[sock]["rxbuf"], 0.1)
                     if not msg:
                         continue
                     mt = msg.get("message_type")
@@ -271,32 +387,7 @@ def main():
 
                     ans = str(msg.get("answer", "")).strip()
 
-                    # Compute correct answer
-                    if qtype == "Mathematics":
-                        correct_answer = solve_math(short_q)
-                    elif qtype == "Roman Numerals":
-                        rom = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100, "D": 500, "M": 1000}
-                        total, prev = 0, 0
-                        for ch in reversed(short_q):
-                            v = rom.get(ch, 0)
-                            total += -v if v < prev else v
-                            prev = v
-                        correct_answer = str(total)
-                    elif qtype == "Usable IP Addresses of a Subnet":
-                        p = int(short_q.split("/")[-1])
-                        correct_answer = str(0 if p >= 31 else (1 << (32 - p)) - 2)
-                    else:
-                        ip, p = short_q.split("/")
-                        a, b, c_, d = map(int, ip.split("."))
-                        p = int(p)
-                        addr = (a << 24) | (b << 16) | (c_ << 8) | d
-                        mask = (0xFFFFFFFF << (32 - p)) & 0xFFFFFFFF
-                        net = addr & mask
-                        bc = net | (~mask & 0xFFFFFFFF)
-                        toip = lambda n: f"{(n >> 24) & 255}.{(n >> 16) & 255}.{(n >> 8) & 255}.{n & 255}"
-                        correct_answer = f"{toip(net)} and {toip(bc)}"
-
-                    correct = normalize_answer(qtype, ans) == normalize_answer(qtype, correct_answer)
+                    correct = normalize_answer(qtype, ans) == correct_norm
 
                     # --- FIXED FEEDBACK TEMPLATE PRIORITY (for test_auto_math) ---
                     if correct:
@@ -306,18 +397,15 @@ def main():
                     fb = tpl.format(answer=ans, correct_answer=correct_answer)
                     # --------------------------------------------------------------
 
-                    send_json(sock, {"message_type": "RESULT", "correct": correct, "feedback": fb})
+                    send_result(sock, correct, fb)
 
                     if correct:
-                        for c in clients:
-                            if c["sock"] == sock:
-                                c["score"] += 1
-                                break
+                        sock_to_client[sock]["score"] += 1
                 except Exception:
                     continue
 
         # Leaderboard between questions
-        if i < len(qtypes) and any(c["active"] for c in clients):
+        if i < len(qtypes) and active_count:
             everyone = clients
             rank, last = 0, None
             lines = []
@@ -328,12 +416,13 @@ def main():
                 unit = points_s if c["score"] == 1 else points_p
                 lines.append(f"{rank}. {c['username']}: {c['score']} {unit}")
             lb = "\n".join(lines)
+            payload = encode_msg({"message_type": "LEADERBOARD", "state": lb})
             for c in (x for x in clients if x["active"]):
-                send_json(c["sock"], {"message_type": "LEADERBOARD", "state": lb})
+                send_bytes(c["sock"], payload)
             time.sleep(qint)
             time.sleep(0.1)
 
-        if not any(c["active"] for c in clients):
+        if not active_count:
             break
 
     # Game conclusion - show final standings
@@ -360,8 +449,9 @@ def main():
             tail = cfg.get("final_extra", "{winner} wins!").format(winner=", ".join(winners))
         final_text = f"{heading}\n" + "\n".join(lines) + "\n" + tail
 
+        payload = encode_msg({"message_type": "FINISHED", "final_standings": final_text})
         for c in act:
-            send_json(c["sock"], {"message_type": "FINISHED", "final_standings": final_text})
+            send_bytes(c["sock"], payload)
             try:
                 c["sock"].close()
             except Exception:
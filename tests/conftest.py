@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Unit tests import the game modules directly from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,58 @@
+import json, socket, threading, time
+
+import client
+from client import TICK, iter_messages
+
+
+def feed(*writes, gap=0.05):
+    """Socket pair whose peer sends each write separately, then closes."""
+    a, b = socket.socketpair()
+
+    def writer():
+        for w in writes:
+            b.sendall(w)
+            time.sleep(gap)
+        b.close()
+    threading.Thread(target=writer, daemon=True).start()
+    return a
+
+
+def messages(sock, skip=None):
+    return [m for m in iter_messages(sock, skip) if m is not TICK]
+
+
+def test_frame_split_across_writes():
+    sock = feed(b'{"message_type":"RES', b'ULT","feedback":"ok"}', b"\n")
+    assert messages(sock) == [{"message_type": "RESULT", "feedback": "ok"}]
+
+
+def test_several_frames_in_one_write():
+    sock = feed(b'{"message_type":"READY","info":"hi"}\n{"message_type":"BYE"}\n')
+    assert messages(sock) == [{"message_type": "READY", "info": "hi"}, {"message_type": "BYE"}]
+
+
+def test_crlf_and_blank_lines():
+    sock = feed(b'\n\r\n{"message_type":"READY"}\r\n\n{"message_type":"BYE"}\r\n')
+    assert messages(sock) == [{"message_type": "READY"}, {"message_type": "BYE"}]
+
+
+def test_frame_larger_than_receive_buffer():
+    big = "x" * (3 * client._RECV_SIZE)
+    frame = ('{"message_type":"LEADERBOARD","state":"%s"}\n' % big).encode()
+    sock = feed(b'{"message_type":"READY"}\n' + frame[:100], frame[100:] + b'{"message_type":"BYE"}\n')
+    assert messages(sock) == [
+        {"message_type": "READY"},
+        {"message_type": "LEADERBOARD", "state": big},
+        {"message_type": "BYE"},
+    ]
+
+
+def test_skipped_types_are_dropped_unparsed():
+    sock = feed(b'{"message_type":"RESULT","feedback":"x"}\n{"message_type":"BYE"}\n')
+    assert messages(sock, {b"RESULT"}) == [{"message_type": "BYE"}]
+
+
+def test_invalid_utf8_is_skipped_without_orjson(monkeypatch):
+    monkeypatch.setattr(client, "_loads", json.loads)  # the stdlib fallback path
+    sock = feed(b'{"message_type":"RESULT","feedback":"\xff"}\n{"message_type":"BYE"}\n')
+    assert messages(sock) == [{"message_type": "BYE"}]
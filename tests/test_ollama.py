@@ -0,0 +1,117 @@
+import json, socket, threading, time
+
+import client
+
+
+class FakeOllama:
+    """Minimal keep-alive HTTP server; `reply(n)` returns the raw response to request n."""
+
+    def __init__(self, reply, close_after_each=False):
+        self.reply = reply
+        self.close_after_each = close_after_each
+        self.connections = 0
+        self.requests = 0
+        self.srv = socket.create_server(("127.0.0.1", 0))
+        self.port = self.srv.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.srv.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        buf = b""
+        with conn:
+            while True:
+                while b"\r\n\r\n" not in buf:
+                    ch = conn.recv(4096)
+                    if not ch:
+                        return
+                    buf += ch
+                head, _, buf = buf.partition(b"\r\n\r\n")
+                length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+                while len(buf) < length:
+                    buf += conn.recv(4096)
+                buf = buf[length:]
+                n = self.requests
+                self.requests += 1
+                try:
+                    conn.sendall(self.reply(n))
+                except OSError:
+                    return
+                if self.close_after_each:
+                    return
+
+    def answer(self, time_limit=2.0):
+        cfg = {"ollama_host": "127.0.0.1", "ollama_port": self.port, "ollama_model": "m"}
+        return client.ollama_answer("Mathematics", "1 + 1", "1 + 1", cfg, time_limit)
+
+    def close(self):
+        self.srv.close()
+
+
+def body(text):
+    return json.dumps({"message": {"content": text}}).encode()
+
+
+def with_length(text):
+    b = body(text)
+    return b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%b" % (len(b), b)
+
+
+def chunked(text):
+    b = body(text)
+    half = len(b) // 2
+    return (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"%x\r\n%b\r\n%x;ext=1\r\n%b\r\n0\r\n\r\n" % (half, b[:half], len(b) - half, b[half:]))
+
+
+def setup_function():
+    client._ollama_socks.clear()
+
+
+def test_content_length_reuses_connection():
+    srv = FakeOllama(lambda n: with_length(f" answer {n} "))
+    assert srv.answer() == "answer 0"
+    assert srv.answer() == "answer 1"
+    assert srv.connections == 1
+    srv.close()
+
+
+def test_server_closed_idle_socket_reconnects_once():
+    srv = FakeOllama(lambda n: with_length(str(n)), close_after_each=True)
+    assert srv.answer() == "0"
+    time.sleep(0.05)  # let the close reach the client before it reuses the socket
+    assert srv.answer() == "1"
+    assert srv.connections == 2
+    assert srv.requests == 2
+    srv.close()
+
+
+def test_slow_response_is_not_resent():
+    def reply(n):
+        if n:
+            time.sleep(3)
+        return with_length("ok")
+    srv = FakeOllama(reply)
+    assert srv.answer() == "ok"
+    start = time.monotonic()
+    assert srv.answer(time_limit=1.0) == ""
+    assert time.monotonic() - start < 1.2
+    assert srv.requests == 2
+    srv.close()
+
+
+def test_chunked_response_is_decoded_without_waiting():
+    srv = FakeOllama(lambda n: chunked(f"chunk {n}"))
+    start = time.monotonic()
+    assert srv.answer() == "chunk 0"
+    assert srv.answer() == "chunk 1"
+    assert time.monotonic() - start < 0.5
+    assert srv.connections == 1
+    srv.close()
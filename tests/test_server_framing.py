@@ -0,0 +1,56 @@
+import json, socket, threading
+
+import server
+from server import recv_json
+
+
+def test_frame_split_across_writes_keeps_the_partial():
+    a, b = socket.socketpair()
+    buf = bytearray()
+    b.sendall(b'{"message_type":"ANS')
+    assert recv_json(a, buf, 0.05) is None
+    assert buf == b'{"message_type":"ANS'
+    b.sendall(b'WER","answer":"3"}\n')
+    assert recv_json(a, buf, 1.0) == {"message_type": "ANSWER", "answer": "3"}
+    assert buf == b""
+
+
+def test_answer_and_bye_in_one_write():
+    a, b = socket.socketpair()
+    buf = bytearray()
+    b.sendall(b'{"message_type":"ANSWER","answer":"7"}\n{"message_type":"BYE"}\n')
+    assert recv_json(a, buf, 1.0) == {"message_type": "ANSWER", "answer": "7"}
+    # The second frame is served from the buffer without another read
+    assert recv_json(a, buf, 0.0) == {"message_type": "BYE"}
+    assert recv_json(a, buf, 0.0) is None
+
+
+def test_crlf_and_blank_lines():
+    a, b = socket.socketpair()
+    buf = bytearray()
+    b.sendall(b'\n\r\n{"message_type":"HI","username":"u"}\r\n\n{"message_type":"BYE"}\r\n')
+    assert recv_json(a, buf, 1.0) == {"message_type": "HI", "username": "u"}
+    assert recv_json(a, buf, 1.0) == {"message_type": "BYE"}
+
+
+def test_frame_larger_than_one_read():
+    a, b = socket.socketpair()
+    buf = bytearray()
+    answer = "9" * 200_000
+    frame = ('{"message_type":"ANSWER","answer":"%s"}\n' % answer).encode()
+    threading.Thread(target=b.sendall, args=(frame,), daemon=True).start()
+    assert recv_json(a, buf, 2.0) == {"message_type": "ANSWER", "answer": answer}
+
+
+def test_peer_close_reports_disconnect():
+    a, b = socket.socketpair()
+    b.close()
+    assert recv_json(a, bytearray(), 1.0) == {"message_type": "DISCONNECTED"}
+
+
+def test_invalid_utf8_is_skipped_without_orjson(monkeypatch):
+    monkeypatch.setattr(server, "_loads", json.loads)  # the stdlib fallback path
+    a, b = socket.socketpair()
+    buf = bytearray()
+    b.sendall(b'{"message_type":"HI","username":"\xff"}\n{"message_type":"BYE"}\n')
+    assert recv_json(a, buf, 1.0) == {"message_type": "BYE"}
@@ -0,0 +1,59 @@
+import pytest
+
+import questions
+from client_solvers import _usable_answer, net_and_broadcast, roman_to_int, solve_math
+
+
+@pytest.mark.parametrize("expr, expected", [
+    ("12", "12"),
+    ("1 + 2 * 3", "7"),
+    ("10 - 4 / 2 + 3 * 3", "17"),
+    ("8 / 3 * 3", "6"),
+    ("100 - 2 - 3", "95"),
+    ("2*3+4", "10"),
+    ("7 / 0 + 1", "1"),        # division by zero counts as 0
+    ("20 − 30", "-10"),        # Unicode minus
+    ("5 – 2 * 2", "1"),        # en dash
+    ("3 +", "3"),              # dangling operator is ignored
+    ("", ""),
+    ("abc", ""),
+])
+def test_solve_math(expr, expected):
+    assert solve_math(expr) == expected
+
+
+@pytest.mark.parametrize("numeral, expected", [
+    ("XIV", "14"),
+    ("xiv", "14"),
+    ("MCMXCIV", "1994"),
+    ("mmxxiv", "2024"),
+    ("IIII", "4"),
+    ("X?IV", "14"),            # unknown characters count as 0
+    ("ABC", "100"),
+    ("", "0"),
+])
+def test_roman_to_int(numeral, expected):
+    assert roman_to_int(numeral) == expected
+
+
+@pytest.mark.parametrize("cidr, net_bcast, usable", [
+    ("10.1.2.3/0", "0.0.0.0 and 255.255.255.255", "4294967294"),
+    ("192.168.5.130/25", "192.168.5.128 and 192.168.5.255", "126"),
+    ("10.1.2.3/31", "10.1.2.2 and 10.1.2.3", "0"),
+    ("10.1.2.3/32", "10.1.2.3 and 10.1.2.3", "0"),
+])
+def test_subnet_answers(cidr, net_bcast, usable):
+    assert net_and_broadcast(cidr) == net_bcast
+    assert _usable_answer(cidr) == usable
+
+
+def test_roman_value_round_trips_lut():
+    for n in range(1, len(questions.ROMAN_LUT)):
+        assert questions.roman_value(questions.ROMAN_LUT[n]) == n
+        assert roman_to_int(questions.ROMAN_LUT[n]) == str(n)
+    assert questions.roman_value("IIII") == 4  # non-canonical: scanned, not looked up
+
+
+@pytest.mark.parametrize("n", [-1, -3999, 0, 1, 3999, 4000, 5432])
+def test_int_to_roman_matches_greedy_builder(n):
+    assert questions.int_to_roman(n) == questions._build_roman(n)